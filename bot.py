@@ -3,6 +3,8 @@ import sqlite3
 from datetime import datetime#, timedelta
 import pytz
 import asyncio
+import json
+import time
 # import zoneinfo
 from pathlib import Path
 from discord import app_commands
@@ -14,7 +16,21 @@ load_dotenv()
 
 MATCH_ADMIN = 1459375669417869473
 
-DB_PATH = Path("stats.db")
+# Lean mode: don't keep every guild member in memory or chunk guilds at startup,
+# members are fetched on demand (and kept for a short while) when a role has to be assigned
+LEAN_MEMBER_CACHE = os.getenv("LEAN_MEMBER_CACHE", "0") == "1"
+MEMBER_FETCH_TTL = 300
+
+# Button bidding: bids are placed with buttons/modal on the lot embed instead of !bid messages,
+# so the message content intent and per-bid message deletes are not needed
+BUTTON_BIDDING = os.getenv("BUTTON_BIDDING", "0") == "1"
+
+# Event recording: when set, bids and interactions are appended to this file (one JSON object per line)
+# so an auction night can be replayed offline with replay_events.py
+RECORD_EVENTS = os.getenv("RECORD_EVENTS")
+
+DB_PATH = Path(os.getenv("DB_PATH", "stats.db"))
+ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", "archives"))
 def init_database():
     """Safe initialization: connects to existing db and creates missing tables/indexes"""
     if not DB_PATH.exists():
@@ -110,6 +126,14 @@ def init_database():
             action      TEXT NOT NULL,          -- 'add' or 'remove'
             timestamp   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
         );
+
+        -- archived seasons, each one's matches live in their own db file (see archive_season)
+        CREATE TABLE IF NOT EXISTS seasons (
+            name                        TEXT PRIMARY KEY,
+            db_file                     TEXT NOT NULL,
+            match_count                 INTEGER DEFAULT 0,
+            archived_at                 TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
         """
     )
     c.executescript(
@@ -136,8 +160,24 @@ tables = [row[0] for row in c.fetchall()]
 print("Tables found in database:", tables)
 conn.close()
 
+# Write-through registry: loaded once here and updated next to every db write that touches
+# players.team_name or teams.captainrole_id, so membership/captain checks don't hit the db
+league_players = {}         # user_id -> team_name (None while in the auction pool)
+captain_role_teams = {}     # captainrole_id -> team_name
+
+def load_registry():
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT user_id, team_name FROM players")
+        league_players.update(c.fetchall())
+        c.execute("SELECT captainrole_id, name FROM teams WHERE captainrole_id IS NOT NULL")
+        captain_role_teams.update((int(role_id), name) for role_id, name in c.fetchall())
+    print(f"Registry loaded: {len(league_players)} player(s), {len(captain_role_teams)} captain role(s)")
+
+load_registry()
+
 intents = discord.Intents.default()
-intents.message_content = True
+intents.message_content = not BUTTON_BIDDING
 intents.members = True
 
 IST = pytz.timezone("Asia/Kolkata")
@@ -150,10 +190,78 @@ current_bid = 0
 highest_bidder_id = None
 highest_bidder_team = None
 bid_timer_task = None
+auction_message = None
+auction_view = None
+lot_players = {}  # lot message id -> player id, only kept while recording so interactions can name their lot
+lot_closed = False  # set by bid_timer as soon as time is up, bids are refused until the next lot opens
+
+if LEAN_MEMBER_CACHE:
+    bot = commands.Bot(
+        command_prefix="!",
+        intents=intents,
+        member_cache_flags=discord.MemberCacheFlags.none(),
+        chunk_guilds_at_startup=False
+    )
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents)
+
+record_file = None
+
+def record_event(kind: str, **fields):
+    global record_file
+    if record_file is None:
+        record_file = open(RECORD_EVENTS, "a", encoding="utf-8", buffering=1)
+    record_file.write(json.dumps({"t": time.time(), "k": kind, **fields}, separators=(",", ":")) + "\n")
+
+def recorded_roles(member):
+    return [[str(r.id), r.name] for r in getattr(member, "roles", [])]
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+fetched_members = {}  # (guild_id, user_id) -> (fetched_at, member)
+
+async def get_or_fetch_member(guild: discord.Guild, user_id: int):
+    """Cached member if there is one, otherwise fetch it over REST and keep it for MEMBER_FETCH_TTL seconds"""
+    member = guild.get_member(user_id)
+    if member:
+        return member
+
+    now = time.monotonic()
+    for key in [k for k, (fetched_at, _) in fetched_members.items() if now - fetched_at >= MEMBER_FETCH_TTL]:
+        del fetched_members[key]
+
+    cached = fetched_members.get((guild.id, user_id))
+    if cached:
+        return cached[1]
+
+    try:
+        member = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+    except discord.HTTPException as e:
+        print(f"Error fetching member {user_id}: {e}")
+        return None
+
+    fetched_members[(guild.id, user_id)] = (now, member)
+    return member
 
 
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if not RECORD_EVENTS:
+        return
+
+    permissions = getattr(interaction.user, "guild_permissions", None)
+    record_event(
+        "interaction",
+        type=interaction.type.value,
+        channel=str(interaction.channel_id),
+        user=str(interaction.user.id),
+        admin=bool(permissions and permissions.administrator),
+        roles=recorded_roles(interaction.user),
+        message=str(interaction.message.id) if interaction.message else None,
+        lot=lot_players.get(interaction.message.id) if interaction.message else None,
+        data=interaction.data
+    )
+
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user}, (ID: {bot.user.id})')
@@ -184,6 +292,7 @@ async def finalize_sale():
         c.execute("UPDATE players SET team_name = ? WHERE user_id = ?", (highest_bidder_team, current_player_id))
         c.execute("UPDATE teams SET budget = budget - ? WHERE name = ?", (current_bid, highest_bidder_team))
         conn.commit()
+    league_players[current_player_id] = highest_bidder_team
 
     with sqlite3.connect(DB_PATH) as conn:
         c = conn.cursor()
@@ -192,16 +301,24 @@ async def finalize_sale():
     
     guild = auction_channel.guild
     role = guild.get_role(int(role_id))
-    member = guild.get_member(int(current_player_id))
+    member = await get_or_fetch_member(guild, int(current_player_id))
 
     if role and member:
         await member.add_roles(role)
 
 async def bid_timer():
-    global current_bid, bid_timer_task
+    global current_bid, bid_timer_task, lot_closed
 
     try:
         await asyncio.sleep(15)
+        lot_closed = True
+
+        if auction_view:
+            auction_view.stop()
+            try:
+                await auction_message.edit(view=None)
+            except discord.HTTPException as e:
+                print(f"Error closing bid buttons: {e}")
 
         if current_bid == 0:
             await auction_channel.send(f"**No bids** for <@{current_player_id}>; Player skipped")
@@ -211,6 +328,7 @@ async def bid_timer():
                     c = conn.cursor()
                     c.execute("UPDATE players SET team_name = '__No_Bids__'  WHERE user_id = ?", (current_player_id,))
                     conn.commit()
+                league_players[current_player_id] = '__No_Bids__'
 
             except Exception as e:
                 print(f"Error marking player skipped: {e}")
@@ -226,6 +344,7 @@ async def start_player_auction():
     global current_player_id, current_bid
     global highest_bidder_id, highest_bidder_team
     global bid_timer_task, auction_active
+    global auction_message, auction_view, lot_closed
 
     if auction_channel is None:
         print("Auction channel not set. Aborting auction")
@@ -247,19 +366,134 @@ async def start_player_auction():
     current_bid = 0
     highest_bidder_id = None
     highest_bidder_team = None
+    lot_closed = False
+
+    if BUTTON_BIDDING:
+        auction_view = BidView(current_player_id)
+        auction_message = await auction_channel.send(embed=build_lot_embed(), view=auction_view)
+        if RECORD_EVENTS:
+            lot_players[auction_message.id] = current_player_id
+    else:
+        auction_message = await auction_channel.send(embed=build_lot_embed())
+    if bid_timer_task:
+        bid_timer_task.cancel()
+    bid_timer_task = asyncio.create_task(bid_timer())
+
+def build_lot_embed():
+    if BUTTON_BIDDING:
+        how_to_bid = "Captains, use the buttons below to raise the bid\nor **Custom** to enter an amount (eg. 10M)"
+    else:
+        how_to_bid = "Use !bid <amount>\n\nExample:\n!bid 10M\n!bid 10000000"
 
     PlayerEmbed = discord.Embed(
         title="Player up for Auction",
-        description=f"<@{current_player_id}> is now open for bidding\n\nUse !bid <amount>\n\nExample:\n!bid 10M\n!bid 10000000",
+        description=f"<@{current_player_id}> is now open for bidding\n\n{how_to_bid}",
         color= discord.Color.blue()
     )
-    PlayerEmbed.add_field(name="Current Bid", value="No bids yet", inline=False)
+    if current_bid:
+        PlayerEmbed.add_field(name="Current Bid", value=f"{current_bid:,} by <@{highest_bidder_id}> ({highest_bidder_team})", inline=False)
+    else:
+        PlayerEmbed.add_field(name="Current Bid", value="No bids yet", inline=False)
     PlayerEmbed.add_field(name="Time remaining", value="15s", inline=False)
+    return PlayerEmbed
+
+def parse_bid_amount(bid_text: str) -> int:
+    bid_text = bid_text.strip().upper()
+    if bid_text.endswith("M"):
+        return int(float(bid_text[:-1]) * 1_000_000)
+    return int(bid_text)
+
+def get_captain_team(member: discord.Member):
+    for role in member.roles:
+        team_name = captain_role_teams.get(role.id)
+        if team_name:
+            return team_name
+    return None
+
+def get_team_budget(team_name: str):
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT budget FROM teams WHERE name = ?", (team_name,))
+        row = c.fetchone()
+        return row[0] if row else None
+
+def accept_bid(bidder_id: int, team_name: str, bid_amount: int) -> bool:
+    """Takes the bid and restarts the lot timer; refused once the timer has started closing the lot"""
+    global current_bid, highest_bidder_id, highest_bidder_team, bid_timer_task
+
+    if lot_closed:
+        return False
+
+    current_bid = bid_amount
+    highest_bidder_id = bidder_id
+    highest_bidder_team = team_name
 
-    await auction_channel.send(embed=PlayerEmbed)
     if bid_timer_task:
         bid_timer_task.cancel()
+
     bid_timer_task = asyncio.create_task(bid_timer())
+    return True
+
+async def submit_button_bid(interaction: discord.Interaction, player_id: str, bid_amount: int):
+    """Validates a bid from the lot buttons/modal; a valid bid is acked by editing the lot embed"""
+    if not auction_active or lot_closed or player_id != current_player_id:
+        await interaction.response.send_message("Bidding for this player is closed", ephemeral=True)
+        return
+
+    team_name = get_captain_team(interaction.user)
+    if not team_name:
+        await interaction.response.send_message("Only team captains can bid", ephemeral=True)
+        return
+
+    if bid_amount <= current_bid:
+        await interaction.response.send_message(f"Bid must be higher than the current bid of **{current_bid:,}**", ephemeral=True)
+        return
+
+    budget = get_team_budget(team_name)
+    if budget is None or bid_amount > budget:
+        await interaction.response.send_message(f"{team_name} can't afford a bid of **{bid_amount:,}**", ephemeral=True)
+        return
+
+    if not accept_bid(interaction.user.id, team_name, bid_amount):
+        await interaction.response.send_message("Bidding for this player is closed", ephemeral=True)
+        return
+    await interaction.response.edit_message(embed=build_lot_embed())
+
+class CustomBidModal(discord.ui.Modal, title="Place a Bid"):
+    amount = discord.ui.TextInput(label="Bid amount", placeholder="eg. 10M or 10000000", max_length=16)
+
+    def __init__(self, player_id: str):
+        super().__init__()
+        self.player_id = player_id
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            bid_amount = parse_bid_amount(self.amount.value)
+        except ValueError:
+            await interaction.response.send_message("Invalid amount, use eg. 10M or 10000000", ephemeral=True)
+            return
+        await submit_button_bid(interaction, self.player_id, bid_amount)
+
+class BidView(discord.ui.View):
+    def __init__(self, player_id: str):
+        super().__init__(timeout=None)
+        self.player_id = player_id
+
+    @discord.ui.button(label="+1M", style=discord.ButtonStyle.primary, custom_id="bid_1m")
+    async def bid_1m(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await submit_button_bid(interaction, self.player_id, current_bid + 1_000_000)
+
+    @discord.ui.button(label="+5M", style=discord.ButtonStyle.primary, custom_id="bid_5m")
+    async def bid_5m(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await submit_button_bid(interaction, self.player_id, current_bid + 5_000_000)
+
+    @discord.ui.button(label="+10M", style=discord.ButtonStyle.primary, custom_id="bid_10m")
+    async def bid_10m(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await submit_button_bid(interaction, self.player_id, current_bid + 10_000_000)
+
+    @discord.ui.button(label="Custom", style=discord.ButtonStyle.secondary, custom_id="bid_custom")
+    async def bid_custom(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(CustomBidModal(self.player_id))
 
 @bot.tree.command(name="startauction", description="Let the auction begin!")
 @app_commands.describe(channel = "The Auction Channel")
@@ -297,6 +531,10 @@ async def startauction(interaction: discord.Interaction, channel: discord.TextCh
                 )
                 affected = c.rowcount
                 conn.commit()
+
+                for user_id, team in league_players.items():
+                    if user_id not in captain_ids and team not in (None, '', '__No_Bids__'):
+                        league_players[user_id] = None
             else:
                 affected = 0
             await interaction.followup.send(f"Reset **{affected}** player(s) back into auction pool")
@@ -334,13 +572,17 @@ async def startauction(interaction: discord.Interaction, channel: discord.TextCh
     auction_active = True
     auction_channel = channel
 
-    await channel.send("**Auction is live**\nUse !bid <amount>")
+    if BUTTON_BIDDING:
+        await channel.send("**Auction is live**\nCaptains, bid with the buttons on each player")
+    else:
+        await channel.send("**Auction is live**\nUse !bid <amount>")
     await start_player_auction()
 
 
 @bot.event
 async def on_message(message: discord.Message):
-    global current_bid, highest_bidder_id, highest_bidder_team, bid_timer_task
+    if BUTTON_BIDDING:
+        return
 
     if message.author.bot:
         return
@@ -353,20 +595,27 @@ async def on_message(message: discord.Message):
     
     if not message.content.lower().startswith("!bid"):
         return
-    
-    captain_roles = [r for r in message.author.roles if r.name.startswith("(C)")]
-    if not captain_roles:
+
+    if RECORD_EVENTS:
+        record_event(
+            "bid",
+            channel=str(message.channel.id),
+            user=str(message.author.id),
+            roles=recorded_roles(message.author),
+            content=message.content
+        )
+
+    if lot_closed:
         await message.delete()
         return
     
-    team_name = captain_roles[0].name.replace("(C)", "", 1)
+    team_name = get_captain_team(message.author)
+    if not team_name:
+        await message.delete()
+        return
 
-    bid_text = message.content[4:].strip().upper()
     try:
-        if bid_text.endswith("M"):
-            bid_amount = int(float(bid_text[:-1]) * 1_000_000)
-        else:
-            bid_amount = int(bid_text)
+        bid_amount = parse_bid_amount(message.content[4:])
 
     except ValueError:
         await message.delete()
@@ -376,41 +625,32 @@ async def on_message(message: discord.Message):
         await message.delete()
         return
     
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("SELECT budget FROM teams WHERE name = ?", (team_name,))
-        budget = c.fetchone()[0]
-
-    if bid_amount > budget:
+    budget = get_team_budget(team_name)
+    if budget is None or bid_amount > budget:
         await message.delete()
         return
     
-    current_bid = bid_amount
-    highest_bidder_id = message.author.id
-    highest_bidder_team = team_name
+    if not accept_bid(message.author.id, team_name, bid_amount):
+        await message.delete()
+        return
 
     await auction_channel.send(f"**New bid** {bid_amount:,} by {message.author.mention} ({team_name})\nTimer reset to 15s")
-
-    if bid_timer_task:
-        bid_timer_task.cancel()
-
-    bid_timer_task = asyncio.create_task(bid_timer())
     await message.delete()
 
 
 @bot.tree.command(name="unenroll", description="Unenroll yourself from the game")
 async def unenroll(interaction: discord.Interaction):
-    user_id = interaction.user.id
+    user_id = str(interaction.user.id)
     try:
+        if user_id not in league_players:
+            await interaction.response.send_message(F"You are not enrolled or your User_ID {user_id} is not found in the database.\nPlease Contact any admin if you think this is a mistake.", ephemeral=True)
+            return
+
         with sqlite3.connect(DB_PATH) as conn:
             c = conn.cursor()
-            c.execute("SELECT user_id FROM players WHERE user_id = ?", (user_id,))
-            if not c.fetchone():
-                await interaction.response.send_message(F"You are not enrolled or your User_ID {user_id} is not found in the database.\nPlease Contact any admin if you think this is a mistake.", ephemeral=True)
-                return
-
             c.execute("DELETE FROM players WHERE user_id = ?", (user_id,))
             conn.commit()
+        league_players.pop(user_id, None)
 
         await interaction.response.send_message(f"**Unenroll Successful**\nUser <@{user_id}> have unenrolled themself from the Cricket Fantasy League")
 
@@ -471,12 +711,12 @@ async def enroll(interaction: discord.Interaction, player_name: str):
     user_id = str(interaction.user.id)
     
     try:
+        if user_id in league_players:
+            await interaction.response.send_message("You're already enrolled!", ephemeral=True)
+            return
+
         with sqlite3.connect(DB_PATH) as conn:
             c = conn.cursor()
-            c.execute("SELECT 1 FROM players WHERE user_id = ?", (user_id,))
-            if c.fetchone():
-                await interaction.response.send_message("You're already enrolled!", ephemeral=True)
-                return
             c.execute(
                 """
                 INSERT INTO players (user_id, team_name, player_name)
@@ -485,16 +725,14 @@ async def enroll(interaction: discord.Interaction, player_name: str):
                 (user_id, player_name)
             )
             conn.commit()
+        league_players[user_id] = None
 
         await interaction.response.send_message("**Enrollment Successful**\nYou are now a part of The Cricket Fatansy League\nYou may now join or create a team", ephemeral=True)
     except Exception as e:
         await interaction.response.send_message(f"Enrollment failed: {e}", ephemeral=True)
 
 async def check_enrolled(user_id: str) -> bool:
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("SELECT 1 FROM players WHERE user_id = ?", (user_id,))
-        return bool(c.fetchone())
+    return user_id in league_players
 
 @bot.tree.command(name="createteam", description="Create a new Team; Your own Dream-Team")
 @app_commands.describe(
@@ -522,21 +760,15 @@ async def createteam(interaction: discord.Interaction, team_name: str, shorthand
         await interaction.response.send_message("Please /enroll first!", ephemeral=True)
         return
     
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-
-        c.execute("SELECT team_name FROM players WHERE user_id = ?", (user_id,))
-        result = c.fetchone()
-
-        if result and result[0] is not None:
-            current_team = result[0]
-            await interaction.response.send_message(
-                f"You are already in team **{current_team}**!\n"
-                "You cannot create another team while in one.\n"
-                "Leave your current team first.",
-                ephemeral=True
-            )
-            return
+    current_team = league_players.get(user_id)
+    if current_team is not None:
+        await interaction.response.send_message(
+            f"You are already in team **{current_team}**!\n"
+            "You cannot create another team while in one.\n"
+            "Leave your current team first.",
+            ephemeral=True
+        )
+        return
     try:
         with sqlite3.connect(DB_PATH) as conn:
             c = conn.cursor()
@@ -555,6 +787,7 @@ async def createteam(interaction: discord.Interaction, team_name: str, shorthand
                 (team_name, str(interaction.user.id))
             )
             conn.commit()
+        league_players[user_id] = team_name
 
     except sqlite3.IntegrityError as e:
         if "UNIQUE constraint failed: teams.name" in str(e):
@@ -580,6 +813,7 @@ async def createteam(interaction: discord.Interaction, team_name: str, shorthand
                 (str(team_role.id), str(captain_role.id), team_name)
             )
             conn.commit()
+        captain_role_teams[captain_role.id] = team_name
 
         await interaction.user.add_roles(captain_role)
 
@@ -616,6 +850,13 @@ async def removeteam(interaction: discord.Interaction, team_name: str):
             c.execute("UPDATE players SET team_name = NULL WHERE team_name = ?", (team_name,))
             conn.commit()
 
+        for user_id, team in league_players.items():
+            if team == team_name:
+                league_players[user_id] = None
+        for role_id, team in list(captain_role_teams.items()):
+            if team == team_name:
+                del captain_role_teams[role_id]
+
     except Exception as e:
         await interaction.response.send_message(f"Database error: {e}",ephemeral=True)
         return
@@ -661,6 +902,480 @@ async def setcaptain(interaction: discord.Interaction, member: discord.Member, r
     except Exception as e:
         await interaction.response.send_message(f"Error: {e}", ephemeral=True)
 
+# Xx -------------------------- xX Live Scoring -------------------------- xX --
+
+LIVE_FLUSH_BALLS = 6                # buffered deliveries are written to the db once an over's worth has built up
+SCORECARD_EDIT_INTERVAL = 5         # seconds between scorecard edits, however fast the balls come in
+
+live_matches = {}  # channel_id -> LiveMatch
+
+BOWLER_WICKETS = {"bowled", "caught", "lbw", "stumped", "hitwicket"}    # dismissals credited to the bowler
+
+class LiveMatch:
+    def __init__(self, match_id: int, team_a: str, team_b: str, scorer_channel):
+        self.match_id = match_id
+        self.teams = [team_a, team_b]
+        self.channel = scorer_channel
+        self.innings = 0                # index into self.teams of the batting side
+        self.runs = [0, 0]
+        self.wickets = [0, 0]
+        self.legal_balls = [0, 0]
+        self.recent = []                # last few deliveries for the scorecard
+        self.pending = []               # deliveries not yet written to the db
+        self.scorecard = None
+        self.last_edit = 0.0
+        self.edit_task = None
+        self.dirty = False              # scored since the scorecard embed was last built
+
+    @property
+    def batting_team(self):
+        return self.teams[self.innings]
+
+    @property
+    def bowling_team(self):
+        return self.teams[1 - self.innings]
+
+def build_scorecard_embed(match: LiveMatch, finished: bool = False):
+    ScoreEmbed = discord.Embed(
+        title=f"{match.teams[0]} vs {match.teams[1]}",
+        description="**Result**" if finished else f"**Live** - {match.batting_team} batting",
+        color=discord.Color.green()
+    )
+    for i, team in enumerate(match.teams):
+        overs = f"{match.legal_balls[i] // 6}.{match.legal_balls[i] % 6}"
+        ScoreEmbed.add_field(name=team, value=f"{match.runs[i]}/{match.wickets[i]} ({overs} ov)", inline=True)
+    if match.recent and not finished:
+        ScoreEmbed.add_field(name="Recent balls", value=" ".join(match.recent), inline=False)
+    ScoreEmbed.set_footer(text=f"Match #{match.match_id}")
+    return ScoreEmbed
+
+def flush_live_match(match: LiveMatch):
+    """Writes the buffered deliveries as per-player deltas in a single transaction"""
+    if not match.pending:
+        return
+
+    deltas = {}  # user_id -> [team_name, runs, balls_faced, wickets, runs_conceded, balls_bowled]
+    team_runs = [0, 0]
+    for batter_id, bowler_id, innings, runs, extra, bowler_wicket in match.pending:
+        batting_team = match.teams[innings]
+        bowling_team = match.teams[1 - innings]
+        batter = deltas.setdefault(batter_id, [batting_team, 0, 0, 0, 0, 0])
+        bowler = deltas.setdefault(bowler_id, [bowling_team, 0, 0, 0, 0, 0])
+        if extra != "wide":
+            batter[1] += runs
+            batter[2] += 1
+        if extra == "none":
+            bowler[5] += 1
+        bowler[4] += runs + (1 if extra != "none" else 0)
+        if bowler_wicket:
+            bowler[3] += 1
+        team_runs[innings] += runs + (1 if extra != "none" else 0)
+
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.executemany(
+            """
+            INSERT INTO match_player_stats
+                (match_id, user_id, team_name, runs_scored, balls_faced, wickets_taken, runs_conceded, balls_bowled)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(match_id, user_id) DO UPDATE SET
+                runs_scored   = runs_scored   + excluded.runs_scored,
+                balls_faced   = balls_faced   + excluded.balls_faced,
+                wickets_taken = wickets_taken + excluded.wickets_taken,
+                runs_conceded = runs_conceded + excluded.runs_conceded,
+                balls_bowled  = balls_bowled  + excluded.balls_bowled
+            """,
+            [(match.match_id, user_id, *delta) for user_id, delta in deltas.items()]
+        )
+        c.execute(
+            """
+            UPDATE matches
+            SET total_runs_team_a = total_runs_team_a + ?, total_runs_team_b = total_runs_team_b + ?
+            WHERE match_id = ?
+            """,
+            (team_runs[0], team_runs[1], match.match_id)
+        )
+        conn.commit()
+
+    match.pending.clear()
+
+async def refresh_scorecard(match: LiveMatch):
+    """Edits the pinned scorecard at most once every SCORECARD_EDIT_INTERVAL seconds"""
+    try:
+        # keeps going while balls land during the sleep or the edit itself
+        while match.dirty:
+            wait = match.last_edit + SCORECARD_EDIT_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            match.dirty = False
+            match.last_edit = time.monotonic()
+            try:
+                await match.scorecard.edit(embed=build_scorecard_embed(match))
+            except discord.HTTPException as e:
+                print(f"Error updating scorecard for match {match.match_id}: {e}")
+    finally:
+        match.edit_task = None
+
+def schedule_scorecard_refresh(match: LiveMatch):
+    match.dirty = True
+    if match.edit_task is None:
+        match.edit_task = asyncio.create_task(refresh_scorecard(match))
+
+@bot.tree.command(name="startmatch", description="Start live scoring for a match in this channel")
+@app_commands.describe(team_a="Team batting first", team_b="Team bowling first")
+async def startmatch(interaction: discord.Interaction, team_a: str, team_b: str):
+    if MATCH_ADMIN not in [r.id for r in interaction.user.roles]:
+        await interaction.response.send_message("You do not have permission to use this command", ephemeral=True)
+        return
+
+    if interaction.channel_id in live_matches:
+        await interaction.response.send_message("A match is already being scored in this channel", ephemeral=True)
+        return
+
+    if team_a == team_b:
+        await interaction.response.send_message("A team can't play itself", ephemeral=True)
+        return
+
+    try:
+        with sqlite3.connect(DB_PATH) as conn:
+            c = conn.cursor()
+            c.execute("SELECT name FROM teams WHERE name IN (?, ?)", (team_a, team_b))
+            if len(c.fetchall()) != 2:
+                await interaction.response.send_message("Both teams must exist in the database", ephemeral=True)
+                return
+            c.execute("INSERT INTO matches (team_a, team_b) VALUES (?, ?)", (team_a, team_b))
+            match_id = c.lastrowid
+            conn.commit()
+    except Exception as e:
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+        return
+
+    match = LiveMatch(match_id, team_a, team_b, interaction.channel)
+
+    # sent as a channel message rather than the interaction response, whose token expires after 15 minutes
+    try:
+        match.scorecard = await interaction.channel.send(embed=build_scorecard_embed(match))
+    except discord.HTTPException as e:
+        with sqlite3.connect(DB_PATH) as conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM matches WHERE match_id = ?", (match_id,))
+            conn.commit()
+        await interaction.response.send_message(f"Couldn't post the scorecard in this channel: {e}", ephemeral=True)
+        return
+
+    match.last_edit = time.monotonic()
+    live_matches[interaction.channel_id] = match
+    await interaction.response.send_message(f"Live scoring started for match #{match_id}", ephemeral=True)
+    try:
+        await match.scorecard.pin()
+    except discord.HTTPException as e:
+        print(f"Couldn't pin scorecard for match {match_id}: {e}")
+
+@bot.tree.command(name="ball", description="Score one delivery of the live match in this channel")
+@app_commands.describe(
+    batter="Batter on strike",
+    bowler="Bowler",
+    runs="Runs off the ball (runs off the bat, or extra runs on a wide/no-ball)",
+    wicket="How the batter got out, if they did - Optional",
+    extra="Wide or no-ball - Optional"
+    )
+@app_commands.choices(
+    wicket=[
+        app_commands.Choice(name="Not out", value="none"),
+        app_commands.Choice(name="Bowled", value="bowled"),
+        app_commands.Choice(name="Caught", value="caught"),
+        app_commands.Choice(name="LBW", value="lbw"),
+        app_commands.Choice(name="Stumped", value="stumped"),
+        app_commands.Choice(name="Hit wicket", value="hitwicket"),
+        app_commands.Choice(name="Run out", value="runout")
+    ],
+    extra=[
+        app_commands.Choice(name="None", value="none"),
+        app_commands.Choice(name="Wide", value="wide"),
+        app_commands.Choice(name="No-ball", value="noball")
+    ]
+)
+async def ball(interaction: discord.Interaction, batter: discord.Member, bowler: discord.Member, runs: app_commands.Range[int, 0, 7], wicket: str = "none", extra: str = "none"):
+    if MATCH_ADMIN not in [r.id for r in interaction.user.roles]:
+        await interaction.response.send_message("You do not have permission to use this command", ephemeral=True)
+        return
+
+    match = live_matches.get(interaction.channel_id)
+    if match is None:
+        await interaction.response.send_message("No live match in this channel, use /startmatch first", ephemeral=True)
+        return
+
+    if league_players.get(str(batter.id)) != match.batting_team:
+        await interaction.response.send_message(f"{batter.mention} is not in **{match.batting_team}**, the batting side", ephemeral=True)
+        return
+    if league_players.get(str(bowler.id)) != match.bowling_team:
+        await interaction.response.send_message(f"{bowler.mention} is not in **{match.bowling_team}**, the bowling side", ephemeral=True)
+        return
+
+    if (extra == "wide" and wicket not in ("none", "stumped", "runout")) or (extra == "noball" and wicket not in ("none", "runout")):
+        await interaction.response.send_message("That dismissal isn't possible off a wide/no-ball", ephemeral=True)
+        return
+
+    i = match.innings
+    match.pending.append((str(batter.id), str(bowler.id), i, runs, extra, wicket in BOWLER_WICKETS))
+    match.runs[i] += runs + (1 if extra != "none" else 0)
+    if extra == "none":
+        match.legal_balls[i] += 1
+    if wicket != "none":
+        match.wickets[i] += 1
+
+    symbol = "W" if wicket != "none" else str(runs)
+    if extra != "none":
+        symbol = f"{symbol}{'wd' if extra == 'wide' else 'nb'}"
+    match.recent = (match.recent + [symbol])[-12:]
+
+    reply = f"Recorded: {symbol}"
+    if len(match.pending) >= LIVE_FLUSH_BALLS:
+        try:
+            flush_live_match(match)
+        except Exception as e:
+            print(f"Error flushing match {match.match_id}: {e}")
+            reply += f"\nSaving to the database failed: {e}\n{len(match.pending)} ball(s) are held in memory and will be retried on the next ball"
+
+    await interaction.response.send_message(reply, ephemeral=True)
+    schedule_scorecard_refresh(match)
+
+@bot.tree.command(name="endinnings", description="End the first innings of the live match in this channel")
+async def endinnings(interaction: discord.Interaction):
+    if MATCH_ADMIN not in [r.id for r in interaction.user.roles]:
+        await interaction.response.send_message("You do not have permission to use this command", ephemeral=True)
+        return
+
+    match = live_matches.get(interaction.channel_id)
+    if match is None or match.innings == 1:
+        await interaction.response.send_message("No first innings in progress in this channel", ephemeral=True)
+        return
+
+    try:
+        flush_live_match(match)
+    except Exception as e:
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+        return
+
+    match.innings = 1
+    match.recent = []
+    await interaction.response.send_message(f"**Innings over**\n{match.bowling_team} {match.runs[0]}/{match.wickets[0]}, {match.batting_team} need {match.runs[0] + 1} to win")
+    schedule_scorecard_refresh(match)
+
+@bot.tree.command(name="endmatch", description="Finish the live match in this channel and save the result")
+async def endmatch(interaction: discord.Interaction):
+    if MATCH_ADMIN not in [r.id for r in interaction.user.roles]:
+        await interaction.response.send_message("You do not have permission to use this command", ephemeral=True)
+        return
+
+    match = live_matches.get(interaction.channel_id)
+    if match is None:
+        await interaction.response.send_message("No live match in this channel", ephemeral=True)
+        return
+
+    if match.runs[0] > match.runs[1]:
+        winner = match.teams[0]
+    elif match.runs[1] > match.runs[0]:
+        winner = match.teams[1]
+    else:
+        winner = "tie"
+
+    try:
+        flush_live_match(match)
+        with sqlite3.connect(DB_PATH) as conn:
+            c = conn.cursor()
+            c.execute("UPDATE matches SET winner = ? WHERE match_id = ?", (winner, match.match_id))
+            conn.commit()
+    except Exception as e:
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+        return
+
+    del live_matches[interaction.channel_id]
+    if match.edit_task:
+        match.edit_task.cancel()
+    try:
+        await match.scorecard.edit(embed=build_scorecard_embed(match, finished=True))
+    except discord.HTTPException as e:
+        print(f"Error updating scorecard for match {match.match_id}: {e}")
+
+    result = "Match tied" if winner == "tie" else f"**{winner}** won"
+    await interaction.response.send_message(f"**Match Over**\n{result}\n{match.teams[0]} {match.runs[0]}/{match.wickets[0]} - {match.teams[1]} {match.runs[1]}/{match.wickets[1]}")
+
+# Xx -------------------------- xX Season Archives -------------------------- xX --
+
+MATCH_COLUMNS = "match_id, match_date, team_a, team_b, winner, total_runs_team_a, total_runs_team_b"
+MATCH_STATS_COLUMNS = (
+    "match_id, user_id, team_name, runs_scored, balls_faced, wickets_taken, "
+    "runs_conceded, balls_bowled, is_captain, is_man_of_match"
+)
+HISTORY_ATTACH_BATCH = 9  # SQLite allows 10 attached dbs per connection by default
+
+def archive_season(season: str) -> int:
+    """
+    Moves every match of the current season into its own db file, returns the number of matches moved.
+    Raises ValueError when there is nothing to archive or the season is already archived
+    """
+    archive_path = ARCHIVE_DIR / f"season_{season}.db"
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT 1 FROM seasons WHERE name = ?", (season,))
+        if c.fetchone() or archive_path.exists():
+            raise ValueError(f"Season **{season}** is already archived")
+        c.execute("SELECT count(*) FROM matches")
+        if c.fetchone()[0] == 0:
+            raise ValueError("There are no matches to archive this season")
+
+    import re
+    ARCHIVE_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+    try:
+        c.execute("BEGIN")
+        # same tables, keys and indexes as the live db, so historical joins/lookups stay indexed
+        c.execute(
+            """
+            SELECT sql FROM main.sqlite_master
+            WHERE tbl_name IN ('matches', 'match_player_stats') AND sql IS NOT NULL
+            ORDER BY type = 'index', tbl_name = 'match_player_stats'
+            """
+        )
+        for (sql,) in c.fetchall():
+            c.execute(re.sub(r"^CREATE (TABLE|INDEX|UNIQUE INDEX) ", r"CREATE \1 archive.", sql))
+        c.execute(f"INSERT INTO archive.matches ({MATCH_COLUMNS}) SELECT {MATCH_COLUMNS} FROM main.matches")
+        c.execute(f"INSERT INTO archive.match_player_stats ({MATCH_STATS_COLUMNS}) SELECT {MATCH_STATS_COLUMNS} FROM main.match_player_stats")
+        c.execute("SELECT count(*) FROM archive.matches")
+        match_count = c.fetchone()[0]
+
+        c.execute("DELETE FROM main.match_player_stats")
+        c.execute("DELETE FROM main.matches")
+        c.execute(
+            "INSERT INTO main.seasons (name, db_file, match_count) VALUES (?, ?, ?)",
+            (season, archive_path.name, match_count)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        c.execute("DETACH DATABASE archive")
+        conn.close()
+        archive_path.unlink(missing_ok=True)
+        raise
+
+    c.execute("DETACH DATABASE archive")
+    conn.close()
+    return match_count
+
+def history_batches():
+    """
+    Yields connections with all_matches / all_match_player_stats temp views; between them they cover
+    the live db and every archived season, each attaching at most HISTORY_ATTACH_BATCH archives.
+    Callers aggregate per connection and merge the results; only career/historical queries need this.
+    Raises FileNotFoundError if an archived season's file is missing, rather than returning partial history
+    """
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT name, db_file FROM seasons ORDER BY archived_at")
+        archives = []
+        for name, db_file in c.fetchall():
+            archive_path = ARCHIVE_DIR / Path(db_file).name
+            if not archive_path.exists():
+                raise FileNotFoundError(f"Archive for season {name} is missing ({archive_path})")
+            archives.append(str(archive_path))
+
+    batches = [archives[i:i + HISTORY_ATTACH_BATCH] for i in range(0, len(archives), HISTORY_ATTACH_BATCH)] or [[]]
+    for n, batch in enumerate(batches):
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            c = conn.cursor()
+            schemas = ["main"] if n == 0 else []
+            for i, db_file in enumerate(batch):
+                c.execute(f"ATTACH DATABASE ? AS season_{i}", (db_file,))
+                schemas.append(f"season_{i}")
+
+            for table, columns in (("matches", MATCH_COLUMNS), ("match_player_stats", MATCH_STATS_COLUMNS)):
+                union = " UNION ALL ".join(f"SELECT {columns} FROM {schema}.{table}" for schema in schemas)
+                c.execute(f"CREATE TEMP VIEW all_{table} AS {union}")
+
+            yield conn
+        finally:
+            conn.close()
+
+@bot.tree.command(name="archiveseason", description="Move this season's matches into an archive database (Admin Only!)")
+@app_commands.describe(season="Season name for the archive, eg. 2026-S1")
+async def archiveseason(interaction: discord.Interaction, season: str):
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message("This action requires administrator privileges", ephemeral=True)
+        return
+
+    import re
+    season = season.strip()
+    if not re.match(r'^[A-Za-z0-9_-]+$', season):
+        await interaction.response.send_message("Season name may only use letters, digits, - and _", ephemeral=True)
+        return
+
+    if live_matches:
+        await interaction.response.send_message("Finish the live match(es) before archiving the season", ephemeral=True)
+        return
+
+    try:
+        match_count = archive_season(season)
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+    except Exception as e:
+        await interaction.response.send_message(f"Error archiving season: {e}", ephemeral=True)
+        return
+
+    await interaction.response.send_message(f"**Season Archived**\n{match_count} match(es) of season **{season}** moved to the archive")
+
+@bot.tree.command(name="career", description="Career match stats across every season")
+@app_commands.describe(member="Player to look up - Optional, defaults to you")
+async def career(interaction: discord.Interaction, member: discord.Member = None):
+    member = member or interaction.user
+
+    # totals: matches, runs, highest, balls_faced, wickets, runs_conceded, balls_bowled, motm
+    totals = [0] * 8
+    try:
+        for conn in history_batches():
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT count(*), total(runs_scored), max(runs_scored), total(balls_faced),
+                       total(wickets_taken), total(runs_conceded), total(balls_bowled), total(is_man_of_match)
+                FROM all_match_player_stats
+                WHERE user_id = ?
+                """,
+                (str(member.id),)
+            )
+            row = c.fetchone()
+            for i, value in enumerate(row):
+                if i == 2:
+                    totals[i] = max(totals[i], value or 0)
+                else:
+                    totals[i] += int(value)
+    except Exception as e:
+        await interaction.response.send_message(f"Database error: {e}", ephemeral=True)
+        return
+
+    matches, runs, highest, balls_faced, wickets, runs_conceded, balls_bowled, motm = totals
+    if not matches:
+        await interaction.response.send_message(f"No matches recorded for {member.mention}", ephemeral=True)
+        return
+
+    strike_rate = f"{runs * 100 / balls_faced:.1f}" if balls_faced else "-"
+    economy = f"{runs_conceded * 6 / balls_bowled:.2f}" if balls_bowled else "-"
+
+    CareerEmbed = discord.Embed(
+        title=f"Career - {member.display_name}",
+        color=discord.Color.gold()
+    )
+    CareerEmbed.add_field(name="Matches", value=str(matches), inline=True)
+    CareerEmbed.add_field(name="Player of the Match", value=str(motm), inline=True)
+    CareerEmbed.add_field(name="Runs", value=f"{runs} (HS {highest}, SR {strike_rate})", inline=False)
+    CareerEmbed.add_field(name="Wickets", value=f"{wickets} (Econ {economy})", inline=False)
+
+    await interaction.response.send_message(embed=CareerEmbed)
+
 @bot.tree.command(name="hello", description="Greets you back")
 async def hello(interaction: discord.Interaction):
     await interaction.response.send_message(f"Hello, {interaction.user.name}! I am Online :D")
@@ -682,4 +1397,5 @@ async def setup_hook():
         print(f"Failed to sync commands:", e)
     print("Commands synced to guild")
 
-bot.run(os.getenv('BOT_TOKEN'))
\ No newline at end of file
+if __name__ == "__main__":
+    bot.run(os.getenv('BOT_TOKEN'))
\ No newline at end of file
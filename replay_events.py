@@ -0,0 +1,373 @@
+# replay_events.py
+# Replays an event log written by bot.py (RECORD_EVENTS=<file>) against a copy of stats.db
+# on a virtual clock, so a whole auction night runs in seconds and can be profiled.
+#
+#   python replay_events.py events.jsonl --db stats.db --profile replay.prof --tracemalloc
+#
+# Run with the same BUTTON_BIDDING setting the log was recorded with.
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+api_calls = Counter()
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock jumps straight to the next scheduled timer instead of waiting for it"""
+
+    def __init__(self):
+        super().__init__()
+        self._virtual_time = 0.0
+        real_select = self._selector.select
+
+        def select(timeout=None):
+            if timeout:
+                self._virtual_time += timeout
+            return real_select(0)
+
+        self._selector.select = select
+
+    def time(self):
+        return self._virtual_time
+
+
+class FakeRole:
+    def __init__(self, guild, role_id, name=""):
+        self.guild = guild
+        self.id = int(role_id)
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+
+    async def delete(self, reason=None):
+        api_calls["role.delete"] += 1
+        self.guild.roles_by_id.pop(self.id, None)
+
+
+class FakeMember:
+    def __init__(self, guild, user_id, roles=(), admin=False):
+        self.guild = guild
+        self.id = int(user_id)
+        self.name = str(user_id)
+        self.bot = False
+        self.mention = f"<@{self.id}>"
+        self.roles = list(roles)
+        self.guild_permissions = argparse.Namespace(administrator=admin)
+
+    def __str__(self):
+        return self.name
+
+    async def add_roles(self, *roles):
+        api_calls["member.add_roles"] += 1
+        self.roles.extend(r for r in roles if r not in self.roles)
+
+    async def remove_roles(self, *roles):
+        api_calls["member.remove_roles"] += 1
+        self.roles = [r for r in self.roles if r not in roles]
+
+
+class FakeMessage:
+    def __init__(self, channel, content="", author=None, embed=None, view=None):
+        self.id = next(FakeGuild.ids)
+        self.channel = channel
+        self.content = content
+        self.author = author
+        self.embed = embed
+        self.view = view
+
+    async def edit(self, **fields):
+        api_calls["message.edit"] += 1
+
+    async def delete(self):
+        api_calls["message.delete"] += 1
+
+    async def pin(self):
+        api_calls["message.pin"] += 1
+
+
+class FakeChannel:
+    def __init__(self, guild, channel_id):
+        self.guild = guild
+        self.id = int(channel_id)
+        self.mention = f"<#{self.id}>"
+
+    def __eq__(self, other):
+        return isinstance(other, FakeChannel) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    async def send(self, content=None, embed=None, view=None):
+        api_calls["channel.send"] += 1
+        return FakeMessage(self, content, embed=embed, view=view)
+
+
+class FakeGuild:
+    ids = iter(range(1, 1 << 62))
+
+    def __init__(self):
+        self.id = 0
+        self.roles_by_id = {}
+        self.members = {}
+        self.channels = {}
+
+    @property
+    def roles(self):
+        return list(self.roles_by_id.values())
+
+    def get_role(self, role_id):
+        return self.roles_by_id.get(int(role_id))
+
+    def role(self, role_id, name=""):
+        role = self.roles_by_id.get(int(role_id))
+        if role is None:
+            role = self.roles_by_id[int(role_id)] = FakeRole(self, role_id, name)
+        elif name:
+            role.name = name
+        return role
+
+    def get_member(self, user_id):
+        return self.member(user_id)
+
+    async def fetch_member(self, user_id):
+        api_calls["guild.fetch_member"] += 1
+        return self.member(user_id)
+
+    def member(self, user_id, roles=None, admin=False):
+        member = self.members.get(int(user_id))
+        if member is None:
+            member = self.members[int(user_id)] = FakeMember(self, user_id)
+        if roles is not None:
+            member.roles = [self.role(role_id, name) for role_id, name in roles]
+            member.guild_permissions.administrator = admin
+        return member
+
+    def get_channel(self, channel_id):
+        channel = self.channels.get(int(channel_id))
+        if channel is None:
+            channel = self.channels[int(channel_id)] = FakeChannel(self, channel_id)
+        return channel
+
+    async def create_role(self, name, **fields):
+        api_calls["guild.create_role"] += 1
+        return self.role(next(FakeGuild.ids), name)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def _ack(self, kind):
+        api_calls[f"response.{kind}"] += 1
+        self.done = True
+
+    async def send_message(self, *args, **kwargs):
+        await self._ack("send_message")
+
+    async def defer(self, *args, **kwargs):
+        await self._ack("defer")
+
+    async def edit_message(self, *args, **kwargs):
+        await self._ack("edit_message")
+
+    async def send_modal(self, modal):
+        await self._ack("send_modal")
+
+
+class FakeFollowup:
+    async def send(self, *args, **kwargs):
+        api_calls["followup.send"] += 1
+
+
+class FakeInteraction:
+    def __init__(self, guild, user, channel, data):
+        self.guild = guild
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.data = data
+        self.message = None
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+
+def load_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def command_kwargs(guild, options):
+    kwargs = {}
+    for option in options or []:
+        if option["type"] == 6:
+            kwargs[option["name"]] = guild.member(option["value"])
+        elif option["type"] == 7:
+            kwargs[option["name"]] = guild.get_channel(option["value"])
+        elif option["type"] == 8:
+            kwargs[option["name"]] = guild.role(option["value"])
+        else:
+            kwargs[option["name"]] = option["value"]
+    return kwargs
+
+
+async def dispatch(bot, guild, event):
+    channel = guild.get_channel(event["channel"])
+
+    if event["k"] == "bid":
+        author = guild.member(event["user"], event["roles"])
+        await bot.on_message(FakeMessage(channel, event["content"], author=author))
+        return
+
+    user = guild.member(event["user"], event["roles"], event["admin"])
+    data = event["data"] or {}
+    interaction = FakeInteraction(guild, user, channel, data)
+
+    if event["type"] == 2:  # slash command
+        command = bot.bot.tree.get_command(data["name"])
+        if command is None:
+            print(f"Skipping unknown command /{data['name']}")
+            return
+        await command.callback(interaction, **command_kwargs(guild, data.get("options")))
+
+    elif event["type"] == 3 and event.get("lot"):  # bid button on a lot
+        # a click on an earlier lot's buttons finds no live view, same as in discord.py's ViewStore
+        view = bot.auction_view
+        if view is None or view.is_finished() or view.player_id != event["lot"]:
+            return
+        for item in view.children:
+            if getattr(item, "custom_id", None) == data.get("custom_id"):
+                await item.callback(interaction)
+
+    elif event["type"] == 5 and event.get("lot"):  # custom bid modal, opened from a lot
+        value = data["components"][0]["components"][0]["value"]
+        try:
+            bid_amount = bot.parse_bid_amount(value)
+        except ValueError:
+            await interaction.response.send_message("Invalid amount", ephemeral=True)
+            return
+        await bot.submit_button_bid(interaction, event["lot"], bid_amount)
+
+
+async def replay(bot, events):
+    guild = FakeGuild()
+    with sqlite3.connect(bot.DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT name, teamrole_id, captainrole_id FROM teams")
+        for name, teamrole_id, captainrole_id in c.fetchall():
+            if teamrole_id:
+                guild.role(teamrole_id, name)
+            if captainrole_id:
+                guild.role(captainrole_id, f"(C){name}")
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    t0 = events[0]["t"]
+    tasks = []
+
+    for event in events:
+        delay = start + (event["t"] - t0) - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(dispatch(bot, guild, event)))
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for event, result in zip(events, results):
+        if isinstance(result, Exception):
+            print(f"Event at {event['t']:.3f} ({event['k']}) raised {result!r}")
+
+    # let the auction run out the remaining lots and anything else still scheduled (scorecard edits, reminders)
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    while pending:
+        done, _ = await asyncio.wait(pending)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                print(f"Background task raised {task.exception()!r}")
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+
+    return loop.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded bot.py event log offline")
+    parser.add_argument("events", help="Event log written with RECORD_EVENTS")
+    parser.add_argument("--db", default="stats.db", help="Database to replay against (a copy is used)")
+    parser.add_argument("--profile", help="Write cProfile stats to this file")
+    parser.add_argument("--tracemalloc", action="store_true", help="Report memory allocations")
+    args = parser.parse_args()
+
+    events = load_events(args.events)
+    if not events:
+        print("No events to replay")
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="cfl_replay_"))
+    try:
+        run_replay(args, events, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_replay(args, events, workdir):
+    db_copy = workdir / "stats.db"
+    if Path(args.db).exists():
+        shutil.copy(args.db, db_copy)
+
+    os.environ["DB_PATH"] = str(db_copy)
+    os.environ["ARCHIVE_DIR"] = str(workdir / "archives")
+    os.environ.pop("RECORD_EVENTS", None)
+    import bot
+
+    loop = VirtualClockLoop()
+    asyncio.set_event_loop(loop)
+    profiler = cProfile.Profile() if args.profile else None
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    wall_start = time.perf_counter()
+
+    try:
+        virtual_seconds = loop.run_until_complete(replay(bot, events))
+    finally:
+        wall_seconds = time.perf_counter() - wall_start
+        if profiler:
+            profiler.disable()
+        leftover = asyncio.all_tasks(loop)
+        for task in leftover:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+        loop.close()
+
+    print(f"\nReplayed {len(events)} event(s): {virtual_seconds:.1f}s of recorded time in {wall_seconds:.3f}s")
+    for name, count in sorted(api_calls.items()):
+        print(f"  {name:<24}{count}")
+
+    if profiler:
+        profiler.dump_stats(args.profile)
+        print(f"\ncProfile stats written to {args.profile}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+    if args.tracemalloc:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"\nMemory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(f"  {stat}")
+
+
+if __name__ == "__main__":
+    main()